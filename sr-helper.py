@@ -21,61 +21,321 @@
 
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import datetime
 import json
+from os import cpu_count, execv
 from pathlib import Path
+from shlex import quote
 from shutil import which
 import subprocess
-from os import listdir
-from time import sleep
+from textwrap import indent
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-SPACE_RANGER_URL = '"https://cf.10xgenomics.com/releases/spatial-exp/spaceranger-3.0.0.tar.gz?Expires=1711892573&Key-Pair-Id=APKAI7S6A5RYOXBWRPDA&Signature=aFYZ9LHh705yiMvx9Qhs4fo~9wvcN0OKbnMKM2pM8UnzCbxaqAJEDZ-mbwm3Azr-Ary9KKMvzSC1fDy2wXI5jv-OySeSIuCh~odZ-1BqQh1xsjzJbVcOSqclzZRQZW5k2e-voXHRCO15uOGYWCEYyooVUwkWFBE5f8bG3UGVe6WDZprs1xp51-7iLD9mxo3KAcbNhDGBMBfTOaHnEK3JHVx7btEdtLZKR1q8FboYv1vEovyFH2Fx0fDRxV5rS9XzIS4GQo5-cicCkGaEPiXdMrpTLYvyKY4mt3h33SrVHujF5v9NOR5lw0~S2UcV7tDG~zRskLvmFwFyCJKaLAUcIw__"'  # nopep8
+
+SPACE_RANGER_URL = "https://cf.10xgenomics.com/releases/spatial-exp/spaceranger-3.0.0.tar.gz?Expires=1711892573&Key-Pair-Id=APKAI7S6A5RYOXBWRPDA&Signature=aFYZ9LHh705yiMvx9Qhs4fo~9wvcN0OKbnMKM2pM8UnzCbxaqAJEDZ-mbwm3Azr-Ary9KKMvzSC1fDy2wXI5jv-OySeSIuCh~odZ-1BqQh1xsjzJbVcOSqclzZRQZW5k2e-voXHRCO15uOGYWCEYyooVUwkWFBE5f8bG3UGVe6WDZprs1xp51-7iLD9mxo3KAcbNhDGBMBfTOaHnEK3JHVx7btEdtLZKR1q8FboYv1vEovyFH2Fx0fDRxV5rS9XzIS4GQo5-cicCkGaEPiXdMrpTLYvyKY4mt3h33SrVHujF5v9NOR5lw0~S2UcV7tDG~zRskLvmFwFyCJKaLAUcIw__"  # nopep8
 SPACE_RANGER_VERSION = "3.0.0"
-HUMAN_REFERENCE_URL = '"https://cf.10xgenomics.com/supp/spatial-exp/refdata-gex-GRCh38-2020-A.tar.gz"'
+HUMAN_REFERENCE_URL = "https://cf.10xgenomics.com/supp/spatial-exp/refdata-gex-GRCh38-2020-A.tar.gz"  # nopep8
 HUMAN_REFERENCE_VERSION = "refdata-gex-GRCh38-2020-A"
-MOUSE_REFERENCE_URL = '"https://cf.10xgenomics.com/supp/spatial-exp/refdata-gex-mm10-2020-A.tar.gz"'
+MOUSE_REFERENCE_URL = "https://cf.10xgenomics.com/supp/spatial-exp/refdata-gex-mm10-2020-A.tar.gz"  # nopep8
 MOUSE_REFERENCE_VERSION = "refdata-gex-mm10-2020-A"
 
+# Command line key, description, URL and extracted directory name of each
+# dependency.
+DEPENDENCIES = (
+    ("sr", "space ranger", SPACE_RANGER_URL,
+     f"spaceranger-{SPACE_RANGER_VERSION}"),
+    ("human", "the human reference genome", HUMAN_REFERENCE_URL,
+     HUMAN_REFERENCE_VERSION),
+    ("mouse", "the mouse reference genome", MOUSE_REFERENCE_URL,
+     MOUSE_REFERENCE_VERSION),
+)
+# First release with `--parallel`, `--no-progress-meter` and the
+# `%{exitcode}` variable of `--write-out`.
+CURL_PARALLEL_VERSION = (7, 75)
+# HTTP status codes of a successful download.
+DOWNLOAD_SUCCESS_CODES = ("200", "206")
+# curl exit code of a server that does not support resuming a download.
+CURL_RESUME_ERROR = "33"
+
+# Absolute paths of the external programs, or `None` if not installed.
+_CURL = which("curl")
+_TAR = which("tar")
+_SBATCH = which("sbatch")
+_BASH = which("bash")
+_PIGZ = which("pigz")
+
+
 # Utility functions
-def _is_tool_installed(name: str) -> bool:
-    """Check whether `name` is on PATH and marked as executable."""
-    return which(name) is not None
+def _dumps(obj) -> bytes:
+    """Serialize `obj` to indented JSON, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
 
 
-def _download_file(url: str, output_name: str) -> None:
-    """Download a file with curl.
+def _loads(data: bytes):
+    """Deserialize JSON, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
-    Args
-        url (str): File URL to use for download.
+
+def _curl_version() -> tuple:
+    """Return the major and minor version numbers of curl."""
+    p = subprocess.run([_CURL, "--version"], capture_output=True)
+    try:
+        # The first line looks like `curl 7.88.1 (x86_64-pc-linux-gnu) ...`.
+        version = p.stdout.split()[1].decode()
+        return tuple(int(n) for n in version.split(".")[:2])
+    except (IndexError, ValueError):
+        return (0, 0)
+
+
+def _transfer_arguments(output_name: str, url: str, write_out: str) -> list:
+    """Return the curl arguments that download one file.
+
+    A partially downloaded file is resumed from its current size, so a
+    file that is already complete is not transferred again.
+
+    Args:
         output_name (str): Name under which to save the file.
+        url (str): File URL to use for download.
+        write_out (str): Status line that curl prints after the transfer.
     """
-    if not _is_tool_installed("curl"):
-        print(f"The program `curl` is not install. Cannot download `{url}`.")
-        return
-    subprocess.run(["curl", "-o", output_name, url], capture_output=True)
+    arguments = ["--silent", "--show-error", "--location", "--fail"]
+    arguments += ["--retry", "5", "-C", "-", "--write-out", write_out]
+    return arguments + ["-o", output_name, url]
+
+
+def _is_download_complete(exit_code: str, http_code: str) -> bool:
+    """Tell whether a curl transfer produced a complete file.
+
+    Args:
+        exit_code (str): Exit code of curl for the transfer.
+        http_code (str): Last HTTP status code received.
+    """
+    if exit_code == "0" and http_code in DOWNLOAD_SUCCESS_CODES:
+        return True
+    # A resumed download of a file that is already complete is answered
+    # with 416, which `--fail` reports with the exit code 22.
+    return exit_code == "22" and http_code == "416"
+
+
+def _download_files(pairs: list) -> list:
+    """Download files with curl.
+
+    All files are fetched concurrently by a single curl process if the
+    installed version supports ``--parallel``. Otherwise, they are
+    downloaded one after the other.
+
+    Args:
+        pairs (list): Tuples of the form ``(output_name, url)``.
+
+    Returns:
+        list: Names of the files that were downloaded successfully.
+    """
+    if not pairs:
+        return []
+    if _CURL is None:
+        print("The program `curl` is not installed. Cannot download files.")
+        return []
+    # Status of each transfer, as `(exit code, HTTP code)`.
+    statuses = {}
+    if _curl_version() >= CURL_PARALLEL_VERSION:
+        # `--next` separates the transfers so that each one resumes from the
+        # size of its own output file.
+        write_out = "%{exitcode} %{http_code} %{filename_effective}\n"
+        transfers = [
+            _transfer_arguments(name, url, write_out) for name, url in pairs
+        ]
+        # `--silent` does not hide the progress meter of parallel transfers.
+        command = [_CURL, "--no-progress-meter", "--parallel"]
+        command += ["--parallel-max", str(len(pairs))]
+        for i, transfer in enumerate(transfers):
+            if i:
+                command.append("--next")
+            command += transfer
+        p = subprocess.run(command, stdout=subprocess.PIPE)
+        for line in p.stdout.decode().splitlines():
+            exit_code, http_code, name = line.split(" ", 2)
+            statuses[name] = (exit_code, http_code)
+    else:
+        for name, url in pairs:
+            p = subprocess.run(
+                [_CURL] + _transfer_arguments(name, url, "%{http_code}"),
+                stdout=subprocess.PIPE
+            )
+            statuses[name] = (str(p.returncode), p.stdout.decode().strip())
+    downloaded = []
+    for name, _ in pairs:
+        exit_code, http_code = statuses.get(name, ("?", "000"))
+        if _is_download_complete(exit_code, http_code):
+            downloaded.append(name)
+            continue
+        print(
+            f"Could not download `{name}` "
+            f"(curl exit code {exit_code}, HTTP status {http_code})."
+        )
+        # The partial file cannot be resumed, so start over on the next run.
+        if exit_code == CURL_RESUME_ERROR:
+            Path(name).unlink(missing_ok=True)
+    return downloaded
+
+
+def _get_extract_command(
+        archive_name: str, dir: str, n_concurrent: int) -> list:
+    """Return the tar command that extracts a gzipped archive.
+
+    The archive is decompressed with pigz if it is installed, which is
+    faster than the gzip used by ``tar -z``.
+
+    Args:
+        archive_name (str): Path of the archive, or `-` for stdin.
+        dir (str): Directory in which to extract the archive.
+        n_concurrent (int): Number of archives extracted at the same time,
+            among which the processor cores are shared.
+    """
+    if _PIGZ is None:
+        return [_TAR, "-xzf", archive_name, "-C", dir]
+    # tar splits the program string into words, so the path is quoted.
+    threads = max(1, (cpu_count() or 4) // n_concurrent)
+    decompressor = f"{quote(_PIGZ)} -d -p {threads}"
+    return [
+        _TAR, "--use-compress-program", decompressor,
+        "-xf", archive_name, "-C", dir
+    ]
+
+
+def _extract_archives(archive_names: list, dir: str) -> list:
+    """Extract gzipped tar archives concurrently.
+
+    Args:
+        archive_names (list): Paths of the archives to extract.
+        dir (str): Directory in which to extract the archives.
+
+    Returns:
+        list: Paths of the archives that were extracted successfully.
+    """
+    procs = []
+    for archive_name in archive_names:
+        procs.append(subprocess.Popen(
+            _get_extract_command(archive_name, dir, len(archive_names)),
+            stdout=subprocess.DEVNULL,
+        ))
+    extracted = []
+    for archive_name, p in zip(archive_names, procs):
+        if p.wait():
+            print(f"Could not extract `{archive_name}`.")
+        else:
+            extracted.append(archive_name)
+    return extracted
+
+
+def _download_and_extract(pairs: list, dir: str) -> list:
+    """Pipe archives downloaded with curl directly into tar.
+
+    The archives are never written to disk. All pipelines run
+    concurrently.
+
+    Args:
+        pairs (list): Tuples of the form ``(archive_name, url)``.
+        dir (str): Directory in which to extract the archives.
+
+    Returns:
+        list: Names of the archives that were extracted successfully.
+    """
+    if not pairs:
+        return []
+    if _CURL is None:
+        print("The program `curl` is not installed. Cannot download files.")
+        return []
+    pipelines = []
+    for archive_name, url in pairs:
+        curl = subprocess.Popen(
+            [_CURL, "--silent", "--show-error", "--location", "--fail",
+             "--retry", "3", url],
+            stdout=subprocess.PIPE
+        )
+        tar = subprocess.Popen(
+            _get_extract_command("-", dir, len(pairs)),
+            stdin=curl.stdout,
+            stdout=subprocess.DEVNULL
+        )
+        # Only tar holds the read end so that curl gets SIGPIPE if tar fails.
+        curl.stdout.close()
+        pipelines.append((archive_name, curl, tar))
+    extracted = []
+    for archive_name, curl, tar in pipelines:
+        tar_code = tar.wait()
+        curl_code = curl.wait()
+        if tar_code or curl_code:
+            print(f"Could not install `{archive_name}`.")
+        else:
+            extracted.append(archive_name)
+    return extracted
+
+
+def _write_if_changed(path: str, text: str) -> None:
+    """Write `text` to `path` unless the file already contains it.
+
+    Args:
+        path (str): Path of the file to write.
+        text (str): Content of the file.
+    """
+    data = text.encode()
+    p = Path(path)
+    if p.is_file() and p.stat().st_size == len(data):
+        if p.read_bytes() == data:
+            return
+    p.write_bytes(data)
 
 
-def _get_script_header(account: str, time: str, mem: int, cpus: int) -> str:
-    """Write a Slurm script header."""
+def _get_script_header(
+        account: str, time: str, mem: int, cpus: int, n_tasks: int) -> str:
+    """Write the header of a Slurm job array script."""
     return (
         "#!/bin/bash\n"
-        + f"#SBATCH --account={account}\n"
-        + f"#SBATCH --time={time}\n"
-        + f"#SBATCH --mem={mem}G\n"
-        + f"#SBATCH --cpus-per-task={cpus}\n\n"
+        f"#SBATCH --account={account}\n"
+        f"#SBATCH --time={time}\n"
+        f"#SBATCH --mem={mem}G\n"
+        f"#SBATCH --cpus-per-task={cpus}\n"
+        f"#SBATCH --array=0-{n_tasks - 1}\n\n"
     )
 
 
-def _wait_until_clear() -> None:
-    """Wait until all jobs are completed."""
-    for _ in range(60):
-        p = subprocess.run(["sq"], capture_output=True)
-        n_jobs = len(p.stdout.split("\n")) - 1
-        print(f"Number of ongoing jobs: {n_jobs}")
-        if n_jobs < 1:
-            break
-        sleep(60)
+def _get_array_script(header: str, bodies: list) -> str:
+    """Write a Slurm job array script whose task `i` executes `bodies[i]`."""
+    parts = [header, "case $SLURM_ARRAY_TASK_ID in\n"]
+    for i, body in enumerate(bodies):
+        parts += [f"{i})\n", indent(body.rstrip("\n"), "    "), "\n    ;;\n"]
+    parts.append("esac\n")
+    return "".join(parts)
+
+
+def _get_submit_script(sbatch: str) -> str:
+    """Write a script that submits the job arrays located next to it.
+
+    Args:
+        sbatch (str): Path of the `sbatch` program.
+    """
+    sbatch = quote(sbatch)
+    return (
+        "#!/bin/bash\n"
+        "set -e\n\n"
+        'script_dir=$(dirname "$0")\n'
+        f"download_id=$({sbatch} --parsable "
+        '"$script_dir/download_array.sh")\n'
+        "download_id=${download_id%%;*}\n"
+        'echo "Submitted download_array.sh as job $download_id."\n\n'
+        "# Task i of the process array waits for task i of the download.\n"
+        f"{sbatch} --dependency=aftercorr:$download_id "
+        '"$script_dir/process_array.sh"\n'
+    )
 
 
 # Command functions
@@ -84,24 +344,45 @@ def install_dependencies(args) -> None:
 
     Args:
         dir (str): Installation directory.
+        keep_archive (bool): If `True`, save the archives in `dir` before
+            extracting them instead of streaming them into tar.
+        skip_sr, skip_human, skip_mouse (bool): If `True`, do not install
+            space ranger, the human genome or the mouse genome.
+        interactive (bool): If `True`, ask the user to confirm each
+            dependency that is not skipped.
     """
     dir = args.dir
-    download_sr = input("Download space ranger [Y/n]? ")
-    download_human = input("Download the human reference genome [Y/n]? ")
-    download_mouse = input("Download the mouse reference genome [Y/n]? ")
+    if _TAR is None:
+        print("The program `tar` is not installed. Cannot extract files.")
+        return
+    requested = []
+    for key, description, url, name in DEPENDENCIES:
+        if getattr(args, f"skip_{key}"):
+            continue
+        if args.interactive:
+            answer = input(f"Download {description} [Y/n]? ")
+            if answer.lower() not in ("y", ""):
+                continue
+        requested.append((url, name))
     Path(dir).mkdir(parents=True, exist_ok=True)
-    if download_sr.lower() in ("y", ""):
-        archive_name = f"{dir}/spaceranger-{SPACE_RANGER_VERSION}.tar.gz"
-        _download_file(SPACE_RANGER_URL, archive_name)
-        subprocess.run(["tar", "-xvzf", archive_name], capture_output=True)
-    if download_human.lower() in ("y", ""):
-        archive_name = f"{dir}/{HUMAN_REFERENCE_VERSION}.tar.gz"
-        _download_file(HUMAN_REFERENCE_URL, archive_name)
-        subprocess.run(["tar", "-xvzf", archive_name], capture_output=True)
-    if download_mouse.lower() in ("y", ""):
-        archive_name = f"{dir}/{MOUSE_REFERENCE_VERSION}.tar.gz"
-        _download_file(MOUSE_REFERENCE_URL, archive_name)
-        subprocess.run(["tar", "-xvzf", archive_name], capture_output=True)
+    # Skip the archives that have already been extracted. The marker file is
+    # only written after a successful extraction, so a partially extracted
+    # directory is extracted again.
+    pending = []
+    markers = {}
+    for url, name in requested:
+        marker = f"{dir}/.{name}.installed"
+        if Path(marker).is_file():
+            print(f"`{dir}/{name}` is already installed. Skipping.")
+        else:
+            pending.append((f"{dir}/{name}.tar.gz", url))
+            markers[f"{dir}/{name}.tar.gz"] = marker
+    if args.keep_archive:
+        extracted = _extract_archives(_download_files(pending), dir)
+    else:
+        extracted = _download_and_extract(pending, dir)
+    for archive_name in extracted:
+        Path(markers[archive_name]).touch()
 
 
 def create_config(args) -> None:
@@ -138,8 +419,7 @@ def create_config(args) -> None:
             }
         ]
     }
-    with open(output, "w") as file:
-        json.dump(empty_config, file, indent=4)
+    Path(output).write_bytes(_dumps(empty_config))
     print(f"Created the empty configuration file `{output}`.")
 
 
@@ -149,8 +429,10 @@ def generate_scripts(args):
     Args:
         configuration (str): Filepath to the configuration file.
     """
-    with open(args.configuration, "r") as file:
-        configuration = json.load(file)
+    configuration = _loads(Path(args.configuration).read_bytes())
+    if not configuration["samples"]:
+        print(f"The file `{args.configuration}` does not list any sample.")
+        return
     out = configuration['raw data directory']
     fastqs = f"{out}/fastq"
     images = f"{out}/images"
@@ -158,81 +440,108 @@ def generate_scripts(args):
     for p in (out, fastqs, images, results):
         Path(p).mkdir(parents=True, exist_ok=True)
     Path(configuration["script directory"]).mkdir(parents=True, exist_ok=True)
-    for i, sample in enumerate(configuration["samples"]):
+    # Values shared by all samples.
+    pipeline_name = configuration["pipeline name"]
+    sratoolkit_activation = configuration["sratoolkit activation"]
+    sr_source = f"{configuration['space ranger directory']}/sourceme.bash"
+    if configuration["reference"] == "human":
+        transcriptome = HUMAN_REFERENCE_VERSION
+    else:
+        transcriptome = MOUSE_REFERENCE_VERSION
+    transcriptome_path = f"{configuration['genome directory']}/{transcriptome}"
+    unknown_slide = f"  --unknown-slide={configuration['version']}"
+    sample_directories = []
+    download_bodies = []
+    process_bodies = []
+    for sample in configuration["samples"]:
         # Download script
         path = f"{fastqs}/{sample['name']}"
-        Path(path).mkdir(parents=True, exist_ok=True)
-        name_root = f"{path}/{configuration['pipeline name']}_S1_L001_"
-        download_script = (
-            _get_script_header(args.account, "00:30:00", 16, 1)
-            + configuration["sratoolkit activation"] + "\n\n"
-            + f"fasterq-dump {path}\n\n"
-            + f'search_dir={path}\n'
-            + 'for file in $search_dir/*; do\n'
-            + '    echo $file\n'
-            + '    if [[ $file == *"_1.fastq" ]]; then\n'
-            + f'        mv $file {name_root}_R1_001.fastq\n'
-            + '    elif [[ $file == *"_2.fastq" ]]; then\n'
-            + f'        mv $file {name_root}_R2_001.fastq\n'
-            + '    else\n'
-            + f'        mv $file {name_root}_R1_001.fastq\n'
-            + '    fi\n'
-            + 'done\n\n'
-            + f'cp {sample["image"]} {path}/image.tiff\n'
+        sample_directories.append(path)
+        name_root = f"{path}/{pipeline_name}_S1_L001_"
+        download_bodies.append(
+            f"{sratoolkit_activation}\n\n"
+            f"fasterq-dump {path}\n\n"
+            f'search_dir={path}\n'
+            'for file in $search_dir/*; do\n'
+            '    echo $file\n'
+            '    if [[ $file == *"_1.fastq" ]]; then\n'
+            f'        mv $file {name_root}_R1_001.fastq\n'
+            '    elif [[ $file == *"_2.fastq" ]]; then\n'
+            f'        mv $file {name_root}_R2_001.fastq\n'
+            '    else\n'
+            f'        mv $file {name_root}_R1_001.fastq\n'
+            '    fi\n'
+            'done\n\n'
+            f'cp {sample["image"]} {path}/image.tiff\n'
         )
         # space ranger script
-        sr_source = f"{configuration['space ranger directory']}/sourceme.bash"
-        if configuration["reference"] == "human":
-            transcriptome = HUMAN_REFERENCE_VERSION
-        else:
-            transcriptome = MOUSE_REFERENCE_VERSION
-        transcriptome_path = f"{configuration['genome directory']}/{transcriptome}"
         if sample["slide"] == None or sample["area"] == None:
-            slide = f"  --unknown-slide={configuration['version']}"
+            slide = unknown_slide
         else:
             slide = (
                 f"  --slide={sample['slide']} \\\n"
-                + f"  --area={sample['area']}"
+                f"  --area={sample['area']}"
             )
-        process_script = (
-            _get_script_header(args.account, "00:55:00", 64, 8)
-            + f"source {sr_source}\n\n"
-            + "spaceranger count \\\n"
-            + f"  --id={results} \\\n"
-            + f"  --transcriptome={transcriptome_path} \\\n"
-            + f"  --fastqs={path} \\\n"
-            + f"  --sample={sample['name']} \\\n"
-            + f"  --image={sample['image']} \\\n"
-            + "  --localcores=8 \\\n"
-            + "  --localmem=64 \\\n"
-            + "  -create-bam=false \\\n"
-            + slide
+        process_bodies.append(
+            f"source {sr_source}\n\n"
+            "spaceranger count \\\n"
+            f"  --id={results} \\\n"
+            f"  --transcriptome={transcriptome_path} \\\n"
+            f"  --fastqs={path} \\\n"
+            f"  --sample={sample['name']} \\\n"
+            f"  --image={sample['image']} \\\n"
+            "  --localcores=8 \\\n"
+            "  --localmem=64 \\\n"
+            "  -create-bam=false \\\n"
+            f"{slide}"
         )
-        # Write files.
-        out = configuration["script directory"]
-        download_name = f'{out}/download_{i}.sh'
-        with open(download_name, "w") as file:
-            file.write(download_script)
-        process_name = f'{out}/process_{i}.sh'
-        with open(process_name, "w") as file:
-            file.write(process_script)
-        print(f"Script files written at `{out}`.")
+    # Write files.
+    n_samples = len(configuration["samples"])
+    download_script = _get_array_script(
+        _get_script_header(args.account, "00:30:00", 16, 1, n_samples),
+        download_bodies
+    )
+    process_script = _get_array_script(
+        _get_script_header(args.account, "00:55:00", 64, 8, n_samples),
+        process_bodies
+    )
+    out = configuration["script directory"]
+    files = [
+        (f"{out}/download_array.sh", download_script),
+        (f"{out}/process_array.sh", process_script),
+        (f"{out}/submit_all.sh", _get_submit_script(_SBATCH or "sbatch")),
+    ]
+    # Parallel file systems have a high latency per metadata operation but
+    # serve concurrent requests well, so the I/O is done by a thread pool.
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(
+            lambda d: Path(d).mkdir(parents=True, exist_ok=True),
+            sample_directories
+        ))
+        list(executor.map(lambda f: _write_if_changed(*f), files))
+    print(f"Script files written at `{out}`.")
 
 
 def run_scripts(args) -> None:
     """Run all script files.
 
+    The Python process is replaced by ``submit_all.sh``, which submits the
+    job arrays and lets Slurm order the download and process tasks.
+
     Args:
         dir (str): Directory in which scripts are stored.
     """
-    scripts = listdir(args.dir)
-    for script in scripts:
-        if "download" in script:
-            subprocess.run(["sbatch", f"{args.dir}/{script}"])
-    _wait_until_clear()
-    for script in scripts:
-        if "process" in script:
-            subprocess.run(["sbatch", f"{args.dir}/{script}"])
+    if _SBATCH is None:
+        print("The program `sbatch` is not installed. Cannot run scripts.")
+        return
+    if _BASH is None:
+        print("The program `bash` is not installed. Cannot run scripts.")
+        return
+    submit_script = Path(args.dir) / "submit_all.sh"
+    if not submit_script.is_file():
+        print(f"`{submit_script}` does not exist. Generate the scripts first.")
+        return
+    execv(_BASH, [_BASH, str(submit_script)])
 
 
 # Command line argument parsing.
@@ -241,10 +550,20 @@ if __name__ == "__main__":
     subparsers = parser.add_subparsers(dest='command')
 
     install = subparsers.add_parser(
-        'get-dependencies',
+        'install-dependencies',
         help='Install required programs and reference files.',
     )
     install.add_argument('dir', type=str, help='Installation directory.')
+    install.add_argument('--keep-archive', action='store_true',
+                         help='Keep the downloaded archives.')
+    install.add_argument('--skip-sr', action='store_true',
+                         help='Do not install space ranger.')
+    install.add_argument('--skip-human', action='store_true',
+                         help='Do not install the human reference genome.')
+    install.add_argument('--skip-mouse', action='store_true',
+                         help='Do not install the mouse reference genome.')
+    install.add_argument('--interactive', action='store_true',
+                         help='Ask before installing each dependency.')
     install.set_defaults(func=install_dependencies)
 
     create_file = subparsers.add_parser(
@@ -270,7 +589,7 @@ if __name__ == "__main__":
         help='Run the Slurm scripts.',
     )
     run.add_argument('dir', type=str, help='script directory.')
-    run.set_defaults(func=install_dependencies)
+    run.set_defaults(func=run_scripts)
 
     args = parser.parse_args()
     try: